@@ -10,30 +10,46 @@ os.environ["OPENCV_FFMPEG_CAPTURE_OPTIONS"] = (
     "max_delay;0|"  # no queuing delay
 )
 
+import sys
+import collections
+import functools
+import queue
 import threading
 import time
-import signal
 import subprocess
 import requests
 from datetime import datetime
 from typing import Optional
 from pathlib import Path
 
+try:
+    import fcntl
+except ImportError:  # not POSIX; the FFmpeg pipe keeps its default size
+    fcntl = None
+
 import cv2
 import numpy as np
-import pytz
 from utilities.startup import startup
 from utilities.warn import NonBlockingBlinker
-from tools.get_rssi import get_rssi
+from tools.get_rssi import get_esp_session, get_rssi
 from utilities.EventAccumulator import EventAccumulator
 from utilities.motion_db_new import log_motion_event
 
 URL = "http://192.168.0.13:81/stream"
-IST = pytz.timezone("Asia/Kolkata")
+IST_OFFSET_SECONDS = 5 * 3600 + 30 * 60  # IST is a fixed offset, no DST
 NO_SIGNAL_PATH = os.path.join(os.path.dirname(__file__), "examples", "no_signal.png")
 FRAME_RETRY_DELAY = 0.5
 FRAME_READ_TIMEOUT = 5.0  # seconds
 CAPTURE_OPEN_TIMEOUT = 10.0  # seconds to wait for capture to open
+FRAME_QUEUE_SIZE = 1  # latest-wins hand-off between pipeline stages
+
+# Thread placement (Linux only; silently skipped where unsupported). Off by
+# default: set CPU sets to pin the capture and encoder/writer threads, and a
+# priority to run the FFmpeg pipe writers under SCHED_FIFO (needs
+# CAP_SYS_NICE).
+CAPTURE_THREAD_CPUS: Optional[set[int]] = None
+ENCODER_THREAD_CPUS: Optional[set[int]] = None
+WRITER_THREAD_FIFO_PRIORITY: Optional[int] = None
 
 # Recording configuration
 ENABLE_RECORDING = True
@@ -53,18 +69,50 @@ except (PermissionError, OSError):
 SEGMENT_SECONDS = 60  # 1 minute per segment
 RTSP_OUT = "rtsp://127.0.0.1:8554/esp_cam1_overlay"
 ENABLE_RTSP = True  # Set to True if you want RTSP streaming
+# Encode once and fan out to the segmenter and RTSP with FFmpeg's tee muxer
+# when both are enabled. Halves pipe traffic and encoder work, but the two
+# outputs share one process: an RTSP failure is ignored until FFmpeg restarts.
+USE_TEE_OUTPUT = False
 USE_DYNAMIC_FPS = False  # Use fixed output FPS for stream stability
 FIXED_OUTPUT_FPS = 9.0
 VIDEO_BITRATE_KBPS = 1500
 VIDEO_BUFSIZE_KBPS = 3000
 
+# Encoder configuration
+# "auto" probes FFmpeg once and picks the first working hardware encoder from
+# HW_ENCODER_PREFERENCE, falling back to libx264. Set an explicit encoder name
+# (e.g. "h264_nvenc") to skip probing.
+VIDEO_ENCODER = os.getenv("CCTV_VIDEO_ENCODER", "auto")
+VAAPI_DEVICE = os.getenv("CCTV_VAAPI_DEVICE", "/dev/dri/renderD128")
+HW_ENCODER_PREFERENCE = (
+    "h264_videotoolbox",  # macOS (Intel Quick Sync / Apple silicon)
+    "h264_nvenc",  # NVIDIA
+    "h264_vaapi",  # Intel/AMD on Linux
+    "h264_v4l2m2m",  # Raspberry Pi
+)
+SOFTWARE_ENCODER = "libx264"
+ENCODER_PROBE_TIMEOUT = 10.0  # seconds per candidate
+FFMPEG_PIPE_SIZE = 1 << 20  # min stdin pipe size (Linux default is 64 KiB)
+FFMPEG_PIPE_MAX_SIZE = 4 << 20  # grow up to this to hold a whole frame
+PIPE_MAX_SIZE_PATH = "/proc/sys/fs/pipe-max-size"
+FFMPEG_SINK_QUEUE_SIZE = 2  # frames buffered per FFmpeg output before dropping oldest
+F_SETPIPE_SZ = 1031  # Linux fcntl command, not exported by older Pythons
+
 # Display configuration
 SHOW_MOTION_BOXES = False  # Show motion detection boxes and ROI polygon
 SHOW_LOCAL_VIEW = False  # Show CV2 preview windows
+RECORD_OVERLAY = True  # Burn the HUD into recorded/streamed frames
 SHOW_MEMORY_BADGE = True  # Show ESP32 memory usage badge
 
 # Motion detection configuration
-MIN_AREA = 800
+ENABLE_MOTION = True  # MOG2 detection, motion events and the motion warning
+MIN_AREA = 800  # in full-resolution pixels
+MOTION_DOWNSCALE = 4  # run detection on a frame shrunk by this factor per side
+MOTION_STRIDE = 3  # run detection on 1 of every N frames, reuse result between
+# Run the motion chain through OpenCL (cv2.UMat) when a device is available.
+# Off by default: at MOTION_DOWNSCALE the upload/download usually costs more
+# than the kernels save, so only enable it where it measures faster.
+USE_OPENCL = os.getenv("CCTV_USE_OPENCL", "0") == "1"
 ROI_PTS = np.array(
     [
         [12, 5],
@@ -150,6 +198,140 @@ ROI_PTS = np.array(
     dtype=np.int32,
 )
 
+# ROI masks rasterized from ROI_PTS, keyed by (height, width, scale)
+_roi_mask_cache: dict[tuple[int, int, int], np.ndarray] = {}
+
+
+def get_roi_mask(shape: tuple[int, ...], scale: int = 1) -> np.ndarray:
+    """Return the cached ROI mask for a (downscaled) frame shape, building it on first use."""
+    key = (shape[0], shape[1], scale)
+    roi_mask = _roi_mask_cache.get(key)
+    if roi_mask is None:
+        roi_mask = np.zeros(key[:2], dtype=np.uint8)
+        pts = np.round(ROI_PTS / scale).astype(np.int32)
+        cv2.fillPoly(roi_mask, [pts], 255)
+        _roi_mask_cache[key] = roi_mask
+    return roi_mask
+
+
+# Morphology kernels. A 3x3 open followed by a 5x5 dilate (two 3x3 dilations)
+# is the same as a 3x3 erode followed by a single 7x7 dilate for rect kernels.
+ERODE_KERNEL = cv2.getStructuringElement(cv2.MORPH_RECT, (3, 3))
+DILATE_KERNEL = cv2.getStructuringElement(cv2.MORPH_RECT, (7, 7))
+
+
+class MotionDetector:
+    """MOG2 motion detector restricted to the ROI polygon.
+
+    Detection runs on a grayscale copy shrunk by MOTION_DOWNSCALE; motion
+    only needs coarse localization and every stage is O(pixels). Boxes are
+    returned in full-resolution coordinates.
+
+    Only every `stride`-th frame is analysed; the frames in between reuse the
+    last result, since a MIN_AREA-sized object persists across many frames.
+    """
+
+    def __init__(
+        self, scale: int = MOTION_DOWNSCALE, stride: int = MOTION_STRIDE
+    ) -> None:
+        self.scale = max(1, int(scale))
+        self.stride = max(1, int(stride))
+        self.frame_idx = 0
+        self.last_boxes: list[tuple[int, int, int, int, float]] = []
+        self.min_area = MIN_AREA / (self.scale * self.scale)
+        # The kernels act on downscaled pixels, so they grow each blob `scale`
+        # times as far as the full-resolution chain does, and partly covered
+        # edge pixels add about one more; trim that back off every box side
+        # so boxes and MIN_AREA keep their full-resolution meaning.
+        growth = DILATE_KERNEL.shape[0] - ERODE_KERNEL.shape[0] + 1
+        self.trim = (self.scale - 1) * growth / 2
+        # History is counted in analysed frames; scale it so the background
+        # still adapts over the same wall-clock span.
+        self.mog2 = cv2.createBackgroundSubtractorMOG2(
+            history=max(1, 500 // self.stride), varThreshold=25, detectShadows=True
+        )
+        self.roi_mask: Optional[np.ndarray] = None
+        self.use_opencl = USE_OPENCL and cv2.ocl.haveOpenCL()
+        if self.use_opencl:
+            cv2.ocl.setUseOpenCL(True)
+            print("Motion detection using OpenCL")
+        self._roi_umat: Optional[cv2.UMat] = None
+        # Resize, grayscale and MOG2 outputs, reused from frame to frame
+        # (reallocated by OpenCV only if the frame size changes)
+        self._small = None
+        self._gray = None
+        self._mask = None
+
+    def detect(self, frame: np.ndarray) -> list[tuple[int, int, int, int, float]]:
+        """Return (x, y, w, h, area) for each motion blob of at least MIN_AREA pixels."""
+        skip = self.frame_idx % self.stride
+        self.frame_idx += 1
+        if skip:
+            return self.last_boxes
+
+        # With OpenCL the frame is uploaded once and every op below up to the
+        # component labelling stays on the device.
+        src = cv2.UMat(frame) if self.use_opencl else frame
+        h, w = frame.shape[:2]
+        mask_shape = (h // self.scale, w // self.scale)
+        if self.scale > 1:
+            small = self._small = cv2.resize(
+                src,
+                (mask_shape[1], mask_shape[0]),
+                dst=self._small,
+                interpolation=cv2.INTER_AREA,
+            )
+        else:
+            small = src
+        # MOG2 models one channel instead of three on grayscale input
+        gray = self._gray = cv2.cvtColor(small, cv2.COLOR_BGR2GRAY, dst=self._gray)
+
+        # threshold -> open -> dilate, fused into erode + one dilate and run
+        # in place on the MOG2 output
+        mask = self._mask = self.mog2.apply(gray, fgmask=self._mask)
+        cv2.threshold(mask, 200, 255, cv2.THRESH_BINARY, dst=mask)
+        cv2.erode(mask, ERODE_KERNEL, dst=mask)
+        cv2.dilate(mask, DILATE_KERNEL, dst=mask)
+
+        # Apply the (cached) ROI mask
+        roi_mask = get_roi_mask(mask_shape, self.scale)
+        if self.use_opencl:
+            if self.roi_mask is not roi_mask:
+                self._roi_umat = cv2.UMat(roi_mask)
+            self.roi_mask = roi_mask
+            cv2.bitwise_and(mask, self._roi_umat, dst=mask)
+            filtered_motion = mask.get()  # labelling runs on the host
+        else:
+            self.roi_mask = roi_mask
+            filtered_motion = cv2.bitwise_and(mask, roi_mask, dst=mask)
+
+        # An idle scene leaves too few foreground pixels for any blob to reach
+        # MIN_AREA; skip the labelling pass entirely
+        if cv2.countNonZero(filtered_motion) < self.min_area:
+            self.last_boxes = []
+            return self.last_boxes
+
+        # One C pass yields every blob's bounding box and pixel area; only the
+        # blobs that pass the area filter are touched from Python.
+        _, _, stats, _ = cv2.connectedComponentsWithStats(
+            filtered_motion, connectivity=8
+        )
+        # label 0 is the background
+        bx, by, bw, bh, barea = stats[1:].T.astype(np.float64)
+        s, trim = self.scale, self.trim
+        x, y = bx * s + trim, by * s + trim
+        w = np.maximum(bw * s - 2 * trim, 0)
+        h = np.maximum(bh * s - 2 * trim, 0)
+        # Keep each blob's fill ratio within its trimmed box
+        area = barea * (w * h) / (bw * bh)
+        keep = np.flatnonzero(area >= MIN_AREA)
+        self.last_boxes = [
+            (round(x[i]), round(y[i]), round(w[i]), round(h[i]), float(area[i]))
+            for i in keep
+        ]
+        return self.last_boxes
+
+
 no_signal_img = cv2.imread(NO_SIGNAL_PATH)
 if no_signal_img is None:
     print(f"Warning: Could not load no_signal.png from {NO_SIGNAL_PATH}")
@@ -173,9 +355,9 @@ startup_lock = threading.Lock()
 camera_adjustments_done = False
 camera_adjustments_lock = threading.Lock()
 
-# Capture opening state
-capture_result = {"cap": None, "done": False}
-capture_lock = threading.Lock()
+# Encoder hand-off state (main loop -> FFmpeg writer thread)
+encode_queue: queue.Queue = queue.Queue(maxsize=FRAME_QUEUE_SIZE)
+encode_thread = None
 
 # RSSI monitoring state
 rssi_value = None
@@ -192,11 +374,31 @@ memory_update_interval = 10  # Update memory every 10 seconds
 # FPS tracking state
 fps_value = 0.0
 fps_lock = threading.Lock()
-fps_frame_times = []
 FPS_SAMPLE_WINDOW = 30  # Calculate FPS over last 30 frames
+fps_frame_times: collections.deque = collections.deque(maxlen=FPS_SAMPLE_WINDOW)
 
 # HUD overlap cooldown configuration
 HUD_HIDE_SECONDS = 5.0
+# Motion whose top-left corner lands here overlaps the timestamp badge, as
+# inclusive (x0, y0, x1, y1) bounds
+TIME_OVERLAP_ZONE = (10, 15, 46, 276)
+
+# HUD timestamp text, re-formatted only when the wall-clock second changes
+HUD_TIMESTAMP_FORMAT = "%Y-%m-%d %I:%M:%S %p"
+_ts_cache = {"sec": -1, "text": ""}
+
+
+def hud_timestamp() -> str:
+    """Return the IST timestamp string for the current second."""
+    sec = int(time.time())
+    if sec != _ts_cache["sec"]:
+        # Shift to IST and format as UTC: all in C, no tz-aware datetime
+        _ts_cache["text"] = time.strftime(
+            HUD_TIMESTAMP_FORMAT, time.gmtime(sec + IST_OFFSET_SECONDS)
+        )
+        _ts_cache["sec"] = sec
+    return _ts_cache["text"]
+
 
 class BoxVisibilityCooldown:
     """Tracks temporary hide windows for HUD boxes after overlap events."""
@@ -223,6 +425,61 @@ class BoxVisibilityCooldown:
 HUD_COOLDOWN = BoxVisibilityCooldown()
 
 
+def _put_latest(q: queue.Queue, item) -> None:
+    """Put an item into a bounded queue, dropping the oldest entry when full."""
+    while True:
+        try:
+            q.put_nowait(item)
+            return
+        except queue.Full:
+            try:
+                q.get_nowait()
+            except queue.Empty:
+                pass
+
+
+class FrameReader:
+    """Reads frames from an opened capture on a background thread.
+
+    Only the newest frame is kept so processing never falls behind the
+    stream. The reader thread owns the capture and releases it on exit.
+    """
+
+    def __init__(self, cap: cv2.VideoCapture) -> None:
+        self._cap = cap
+        self._frames: queue.Queue = queue.Queue(maxsize=FRAME_QUEUE_SIZE)
+        self._stop = threading.Event()
+        self._thread = threading.Thread(target=self._run, daemon=True)
+        self._thread.start()
+
+    def _run(self) -> None:
+        tune_current_thread("capture", CAPTURE_THREAD_CPUS)
+        try:
+            while not self._stop.is_set():
+                ret, frame = self._cap.read()
+                if not ret or frame is None:
+                    break
+                _put_latest(self._frames, frame)
+        except Exception as e:
+            print(f"Frame reader error: {e}")
+        finally:
+            # None tells the consumer the stream is gone
+            _put_latest(self._frames, None)
+            self._cap.release()
+
+    def read(self, timeout: float) -> Optional[np.ndarray]:
+        """Return the newest frame, or None if the stream failed or timed out."""
+        try:
+            return self._frames.get(timeout=timeout)
+        except queue.Empty:
+            print("Frame read timed out - forcing restart.")
+            return None
+
+    def stop(self) -> None:
+        """Ask the reader to exit; the capture is released once read() returns."""
+        self._stop.set()
+
+
 def _save_accumulated_motion_event(event: dict[str, float]) -> None:
     """Persist an EventAccumulator event using the new motion DB schema."""
     start_ts = event.get("start_time")
@@ -244,14 +501,187 @@ def _save_accumulated_motion_event(event: dict[str, float]) -> None:
 acc = EventAccumulator(cooldown=15, onSave=_save_accumulated_motion_event)
 
 # Recording state
-ffmpeg_record_proc: Optional[subprocess.Popen] = None
-ffmpeg_rtsp_proc: Optional[subprocess.Popen] = None
 ffmpeg_lock = threading.Lock()
 expected_frame_size: Optional[tuple[int, int]] = (
     None  # (width, height) that FFmpeg expects
 )
 current_fps: Optional[float] = None  # Active FPS used by FFmpeg
 
+# Encoder selection state (resolved once, shared by both pipelines)
+video_encoder: Optional[str] = None
+video_encoder_lock = threading.Lock()
+
+# CPUs the process may use before any thread is pinned; FFmpeg gets all of them
+PROCESS_CPUS: Optional[set[int]] = (
+    os.sched_getaffinity(0) if hasattr(os, "sched_getaffinity") else None
+)
+
+
+def tune_current_thread(
+    label: str, cpus: Optional[set[int]], fifo_priority: Optional[int] = None
+) -> None:
+    """Pin the calling thread to `cpus` and optionally run it under SCHED_FIFO."""
+    if cpus and hasattr(os, "sched_setaffinity"):
+        usable = cpus & os.sched_getaffinity(0)
+        if usable:
+            try:
+                os.sched_setaffinity(0, usable)
+            except OSError as e:
+                print(f"Could not pin {label} thread to CPUs {sorted(usable)}: {e}")
+    if fifo_priority is not None and hasattr(os, "sched_setscheduler"):
+        # Children (threads or processes) fall back to SCHED_OTHER
+        policy = os.SCHED_FIFO | getattr(os, "SCHED_RESET_ON_FORK", 0)
+        try:
+            os.sched_setscheduler(0, policy, os.sched_param(fifo_priority))
+        except OSError as e:
+            print(f"Could not set SCHED_FIFO for {label} thread: {e}")
+
+
+def _tune_writer_thread() -> None:
+    tune_current_thread(
+        "FFmpeg writer", ENCODER_THREAD_CPUS, WRITER_THREAD_FIFO_PRIORITY
+    )
+
+
+def start_untuned(starter, *args) -> Optional[subprocess.Popen]:
+    """Call `starter(*args)` on a fresh thread reset to the process defaults.
+
+    A child process inherits the CPU affinity and scheduling policy of the
+    thread that forks it, so FFmpeg is never launched from a pinned or
+    real-time writer thread.
+    """
+    result: dict = {"proc": None}
+
+    def _launch() -> None:
+        if PROCESS_CPUS and hasattr(os, "sched_setaffinity"):
+            try:
+                os.sched_setaffinity(0, PROCESS_CPUS)
+            except OSError:
+                pass
+        if hasattr(os, "sched_setscheduler"):
+            try:
+                os.sched_setscheduler(0, os.SCHED_OTHER, os.sched_param(0))
+            except OSError:
+                pass
+        try:
+            result["proc"] = starter(*args)
+        except Exception as e:
+            print(f"FFmpeg start error: {e}")
+
+    launcher = threading.Thread(target=_launch, name="ffmpeg-launcher", daemon=True)
+    launcher.start()
+    launcher.join()
+    return result["proc"]
+
+
+def _enlarge_pipe(proc: subprocess.Popen, frame_bytes: int = 0) -> None:
+    """Raise the FFmpeg stdin pipe capacity so a whole frame fits in one write().
+
+    Asks for at least FFMPEG_PIPE_SIZE, or one frame up to FFMPEG_PIPE_MAX_SIZE,
+    capped at the kernel's pipe-max-size (sizes above it need CAP_SYS_RESOURCE).
+    """
+    if proc.stdin is None or fcntl is None or not sys.platform.startswith("linux"):
+        return
+    size = max(FFMPEG_PIPE_SIZE, min(frame_bytes, FFMPEG_PIPE_MAX_SIZE))
+    try:
+        with open(PIPE_MAX_SIZE_PATH) as f:
+            size = min(size, int(f.read()))
+    except (OSError, ValueError):
+        pass
+
+    # Fall back to the base size if the larger request is refused
+    for attempt in sorted({size, FFMPEG_PIPE_SIZE}, reverse=True):
+        try:
+            fcntl.fcntl(proc.stdin.fileno(), F_SETPIPE_SZ, attempt)
+            return
+        except OSError as e:
+            error = e
+    print(f"Could not enlarge FFmpeg pipe: {error}")
+
+
+def _encoder_args(encoder: str) -> tuple[list[str], list[str]]:
+    """Return (pre-input, post-input) FFmpeg arguments for an H.264 encoder.
+
+    Frames arrive as yuv420p, which every encoder below accepts natively, so
+    only VAAPI needs a filter (to upload frames to a GPU surface).
+    """
+    if encoder == "h264_nvenc":
+        return [], ["-c:v", encoder, "-preset", "p4"]
+    if encoder == "h264_vaapi":
+        return ["-vaapi_device", VAAPI_DEVICE], [
+            "-vf",
+            "format=nv12,hwupload",
+            "-c:v",
+            encoder,
+        ]
+    if encoder == SOFTWARE_ENCODER:
+        return [], ["-c:v", encoder, "-preset", "veryfast", "-tune", "zerolatency"]
+    return [], ["-c:v", encoder]
+
+
+def _probe_encoder(encoder: str) -> bool:
+    """Check that FFmpeg can actually open the encoder on this host."""
+    pre_args, post_args = _encoder_args(encoder)
+    cmd = [
+        "ffmpeg",
+        "-nostdin",
+        "-hide_banner",
+        "-loglevel",
+        "error",
+        *pre_args,
+        "-f",
+        "lavfi",
+        "-i",
+        "nullsrc=s=256x256:d=0.1,format=yuv420p",
+        "-frames:v",
+        "1",
+        *post_args,
+        "-f",
+        "null",
+        "-",
+    ]
+    try:
+        result = subprocess.run(
+            cmd,
+            stdout=subprocess.DEVNULL,
+            stderr=subprocess.DEVNULL,
+            timeout=ENCODER_PROBE_TIMEOUT,
+        )
+        return result.returncode == 0
+    except Exception:
+        return False
+
+
+def get_video_encoder() -> str:
+    """Resolve the H.264 encoder once so both FFmpeg pipelines use the same one."""
+    global video_encoder
+    with video_encoder_lock:
+        if video_encoder is not None:
+            return video_encoder
+
+        if VIDEO_ENCODER != "auto":
+            video_encoder = VIDEO_ENCODER
+        else:
+            try:
+                listing = subprocess.run(
+                    ["ffmpeg", "-hide_banner", "-encoders"],
+                    capture_output=True,
+                    text=True,
+                    timeout=ENCODER_PROBE_TIMEOUT,
+                ).stdout
+            except Exception as e:
+                print(f"Failed to list FFmpeg encoders: {e}")
+                listing = ""
+
+            video_encoder = SOFTWARE_ENCODER
+            for candidate in HW_ENCODER_PREFERENCE:
+                if candidate in listing and _probe_encoder(candidate):
+                    video_encoder = candidate
+                    break
+
+        print(f"Using video encoder: {video_encoder}")
+        return video_encoder
+
 
 def start_ffmpeg_record(
     width: int, height: int, fps: float
@@ -261,17 +691,19 @@ def start_ffmpeg_record(
     out_pattern = BASE_DIR / "recording_%Y%m%d_%H%M%S.mp4"
     safe_fps = max(1.0, fps)
     gop_size = max(1, int(round(safe_fps)))
+    pre_input_args, encoder_args = _encoder_args(get_video_encoder())
 
     cmd = [
         "ffmpeg",
         "-nostdin",
         "-hide_banner",
         "-y",
-        # raw frames over stdin
+        *pre_input_args,
+        # raw I420 frames over stdin
         "-f",
         "rawvideo",
         "-pix_fmt",
-        "bgr24",
+        "yuv420p",
         "-s",
         f"{width}x{height}",
         "-r",
@@ -282,12 +714,8 @@ def start_ffmpeg_record(
         "-",
         "-map",
         "0:v",
-        # videotoolbox-friendly pixel format
-        "-vf",
-        "format=nv12",
-        # hardware encoder (Intel Mac)
-        "-c:v",
-        "h264_videotoolbox",
+        # hardware encoder when available (see get_video_encoder)
+        *encoder_args,
         # stable quality (avoid blur/clear cycling)
         "-b:v",
         f"{VIDEO_BITRATE_KBPS}k",
@@ -327,6 +755,7 @@ def start_ffmpeg_record(
             stderr=logf,  # keep stderr for diagnostics
             bufsize=0,
         )
+        _enlarge_pipe(proc, width * height * 3 // 2)  # one I420 frame
         print(f"FFmpeg VFR recording started: {out_pattern}")
         return proc
     except Exception as e:
@@ -340,16 +769,18 @@ def start_ffmpeg_rtsp(
     """Start FFmpeg process for variable frame rate RTSP restream."""
     safe_fps = max(1.0, fps)
     gop_size = max(1, int(round(safe_fps)))
+    pre_input_args, encoder_args = _encoder_args(get_video_encoder())
     cmd = [
         "ffmpeg",
         "-nostdin",
         "-hide_banner",
         "-y",
-        # Raw frames from Python
+        *pre_input_args,
+        # Raw I420 frames from Python
         "-f",
         "rawvideo",
         "-pix_fmt",
-        "bgr24",
+        "yuv420p",
         "-s",
         f"{width}x{height}",
         "-r",
@@ -360,12 +791,8 @@ def start_ffmpeg_rtsp(
         "-",
         "-map",
         "0:v",
-        # Convert to videotoolbox-friendly format
-        "-vf",
-        "format=nv12",
-        # Hardware encoder (Intel Quick Sync via VideoToolbox)
-        "-c:v",
-        "h264_videotoolbox",
+        # Hardware encoder when available (see get_video_encoder)
+        *encoder_args,
         # Stable bitrate (no pulsing)
         "-b:v",
         f"{VIDEO_BITRATE_KBPS}k",
@@ -396,6 +823,7 @@ def start_ffmpeg_rtsp(
             stderr=logf,
             bufsize=0,
         )
+        _enlarge_pipe(proc, width * height * 3 // 2)  # one I420 frame
         print(f"FFmpeg VFR RTSP started: {RTSP_OUT}")
         return proc
     except Exception as e:
@@ -403,6 +831,91 @@ def start_ffmpeg_rtsp(
         return None
 
 
+def start_ffmpeg_tee(
+    width: int, height: int, fps: float
+) -> Optional[subprocess.Popen]:
+    """Start one FFmpeg process that records segments and publishes RTSP via tee."""
+    BASE_DIR.mkdir(parents=True, exist_ok=True)
+    out_pattern = BASE_DIR / "recording_%Y%m%d_%H%M%S.mp4"
+    safe_fps = max(1.0, fps)
+    gop_size = max(1, int(round(safe_fps)))
+    pre_input_args, encoder_args = _encoder_args(get_video_encoder())
+    record_opts = ":".join(
+        [
+            "f=segment",
+            f"segment_time={SEGMENT_SECONDS}",
+            "segment_format=mp4",
+            "segment_format_options=movflags=+faststart",
+            "reset_timestamps=1",
+            "strftime=1",
+        ]
+    )
+    # A failing RTSP publisher must not take the recording down with it
+    rtsp_opts = "f=rtsp:rtsp_transport=tcp:onfail=ignore"
+
+    cmd = [
+        "ffmpeg",
+        "-nostdin",
+        "-hide_banner",
+        "-y",
+        *pre_input_args,
+        # Raw I420 frames over stdin
+        "-f",
+        "rawvideo",
+        "-pix_fmt",
+        "yuv420p",
+        "-s",
+        f"{width}x{height}",
+        "-r",
+        f"{safe_fps:.2f}",  # Match input cadence to measured FPS
+        "-use_wallclock_as_timestamps",
+        "1",
+        "-i",
+        "-",
+        "-map",
+        "0:v",
+        # One encode shared by both outputs
+        *encoder_args,
+        "-b:v",
+        f"{VIDEO_BITRATE_KBPS}k",
+        "-maxrate",
+        f"{VIDEO_BITRATE_KBPS}k",
+        "-bufsize",
+        f"{VIDEO_BUFSIZE_KBPS}k",
+        "-g",
+        str(gop_size),
+        "-bf",
+        "0",
+        "-f",
+        "tee",
+        f"[{record_opts}]{out_pattern}|[{rtsp_opts}]{RTSP_OUT}",
+    ]
+
+    try:
+        log_path = BASE_DIR / "ffmpeg_tee.log"
+        logf = open(log_path, "ab", buffering=0)
+        proc = subprocess.Popen(
+            cmd,
+            stdin=subprocess.PIPE,
+            stdout=subprocess.DEVNULL,
+            stderr=logf,
+            bufsize=0,
+        )
+        _enlarge_pipe(proc, width * height * 3 // 2)  # one I420 frame
+        print(f"FFmpeg tee started: {out_pattern} + {RTSP_OUT}")
+        return proc
+    except Exception as e:
+        print(f"Failed to start FFmpeg tee: {e}")
+        return None
+
+
+def _write_all(fd: int, data: memoryview) -> None:
+    """Write a whole buffer straight to a pipe fd, continuing after short writes."""
+    while data:
+        written = os.write(fd, data)
+        data = data[written:]
+
+
 def stop_ffmpeg(proc: Optional[subprocess.Popen]) -> None:
     """Stop FFmpeg process gracefully."""
     if proc is None:
@@ -420,20 +933,111 @@ def stop_ffmpeg(proc: Optional[subprocess.Popen]) -> None:
             pass
 
 
+class FFmpegSink:
+    """One FFmpeg output process fed by its own writer thread.
+
+    Frames are queued as (I420 buffer, size, fps) and written in order; when
+    the queue is full the oldest frame is dropped, so a stalled output never
+    holds up the other one or the encoder thread. The writer thread owns the
+    process: it (re)starts FFmpeg on first use, after a pipe error or exit,
+    and when the frame size or rate changes.
+    """
+
+    def __init__(self, label: str, starter) -> None:
+        self.label = label
+        self.starter = starter
+        self.queue: queue.Queue = queue.Queue(maxsize=FFMPEG_SINK_QUEUE_SIZE)
+        self.proc: Optional[subprocess.Popen] = None
+        self.params: Optional[tuple[tuple[int, int], float]] = None
+        self.thread: Optional[threading.Thread] = None
+
+    def submit(self, data: memoryview, size: tuple[int, int], fps: float) -> None:
+        """Queue a frame buffer for this output; never blocks."""
+        if self.thread is None or not self.thread.is_alive():
+            self.thread = threading.Thread(
+                target=self._run, name=f"ffmpeg-{self.label}", daemon=True
+            )
+            self.thread.start()
+        _put_latest(self.queue, (data, size, fps))
+
+    def stop(self) -> None:
+        """Stop the writer thread and the FFmpeg process."""
+        if self.thread is not None:
+            _put_latest(self.queue, None)
+            self.thread.join(timeout=5)
+            self.thread = None
+        stop_ffmpeg(self.proc)
+        self.proc = None
+        self.params = None
+
+    def _run(self) -> None:
+        _tune_writer_thread()
+        while True:
+            item = self.queue.get()
+            if item is None:
+                break
+            try:
+                self._write(*item)
+            except Exception as e:
+                print(f"FFmpeg {self.label} write error: {e}")
+
+    def _write(self, data: memoryview, size: tuple[int, int], fps: float) -> None:
+        if self.proc is not None and self.params != (size, fps):
+            stop_ffmpeg(self.proc)
+            self.proc = None
+        if self.proc is None:
+            self.proc = start_untuned(self.starter, size[0], size[1], fps)
+            self.params = (size, fps)
+            if self.proc is None:
+                return
+        try:
+            if self.proc.stdin:
+                _write_all(self.proc.stdin.fileno(), data)
+        except (BrokenPipeError, IOError) as err:
+            # An exited FFmpeg closes its stdin, so this is also where a dead
+            # process is noticed; no per-frame poll() is needed
+            exit_code = self.proc.poll()
+            if exit_code is not None:
+                print(f"FFmpeg {self.label} exited (code {exit_code}); restarting...")
+            else:
+                print(f"FFmpeg {self.label} pipe error ({err}); restarting...")
+            stop_ffmpeg(self.proc)
+            self.proc = None
+
+
+record_sink = FFmpegSink("recording", start_ffmpeg_record)
+rtsp_sink = FFmpegSink("rtsp", start_ffmpeg_rtsp)
+tee_sink = FFmpegSink("tee", start_ffmpeg_tee)
+
+# Sinks fed by write_frame_to_ffmpeg, resolved once from the output flags
+if USE_TEE_OUTPUT and ENABLE_RECORDING and ENABLE_RTSP:
+    active_sinks: tuple = (tee_sink,)
+else:
+    active_sinks = tuple(
+        sink
+        for sink, enabled in ((record_sink, ENABLE_RECORDING), (rtsp_sink, ENABLE_RTSP))
+        if enabled
+    )
+
+
 def write_frame_to_ffmpeg(frame: np.ndarray) -> bool:
-    """Push a frame into the recording/RTSP FFmpeg pipelines, restarting them when needed."""
-    global ffmpeg_record_proc, ffmpeg_rtsp_proc, expected_frame_size, current_fps
+    """Convert a frame once and queue it for the recording/RTSP FFmpeg outputs."""
+    global expected_frame_size, current_fps
 
-    if not ENABLE_RECORDING and not ENABLE_RTSP:
+    if not active_sinks:
         return True
 
+    h, w = frame.shape[:2]
+    # Only the size/rate bookkeeping is shared with other threads; the
+    # conversion and hand-off below run outside the lock
     with ffmpeg_lock:
-        h, w = frame.shape[:2]
-        new_size = (w, h)
+        # 4:2:0 chroma subsampling needs even dimensions
+        new_size = (w & ~1, h & ~1)
 
         # Get current FPS from the FPS tracker
-        with fps_lock:
-            measured_fps = fps_value if fps_value > 0 else FIXED_OUTPUT_FPS
+        measured_fps = fps_value  # single global read; no lock needed
+        if measured_fps <= 0:
+            measured_fps = FIXED_OUTPUT_FPS
 
         # Check if we need to restart FFmpeg due to size or FPS change
         fps_changed = False
@@ -445,7 +1049,8 @@ def write_frame_to_ffmpeg(frame: np.ndarray) -> bool:
                     f"FPS changed from {current_fps:.2f} to {measured_fps:.2f}; restarting FFmpeg pipelines."
                 )
 
-        # Track the canonical size expected by the encoders
+        # Track the canonical size expected by the encoders; the sinks restart
+        # their FFmpeg process when the size or rate they are handed changes
         if expected_frame_size is None:
             expected_frame_size = new_size
             current_fps = measured_fps if USE_DYNAMIC_FPS else FIXED_OUTPUT_FPS
@@ -455,73 +1060,72 @@ def write_frame_to_ffmpeg(frame: np.ndarray) -> bool:
                     f"Frame size changed from {expected_frame_size[0]}x{expected_frame_size[1]} to {w}x{h}; "
                     "restarting FFmpeg pipelines."
                 )
-            if ffmpeg_record_proc is not None:
-                stop_ffmpeg(ffmpeg_record_proc)
-                ffmpeg_record_proc = None
-            if ffmpeg_rtsp_proc is not None:
-                stop_ffmpeg(ffmpeg_rtsp_proc)
-                ffmpeg_rtsp_proc = None
             expected_frame_size = new_size
             current_fps = measured_fps if USE_DYNAMIC_FPS else FIXED_OUTPUT_FPS
 
-        target_width, target_height = expected_frame_size
         if USE_DYNAMIC_FPS:
             target_fps = current_fps if current_fps is not None else measured_fps
         else:
             target_fps = FIXED_OUTPUT_FPS
 
-        # Ensure recording process is alive when recording enabled
-        if ENABLE_RECORDING:
-            if ffmpeg_record_proc is not None and ffmpeg_record_proc.poll() is not None:
-                exit_code = ffmpeg_record_proc.poll()
-                print(f"Recording FFmpeg exited (code {exit_code}); restarting...")
-                stop_ffmpeg(ffmpeg_record_proc)
-                ffmpeg_record_proc = None
-            if ffmpeg_record_proc is None:
-                ffmpeg_record_proc = start_ffmpeg_record(
-                    target_width, target_height, target_fps
-                )
+        size = expected_frame_size
 
-        # Ensure RTSP process is alive when enabled
-        if ENABLE_RTSP:
-            if ffmpeg_rtsp_proc is not None and ffmpeg_rtsp_proc.poll() is not None:
-                exit_code = ffmpeg_rtsp_proc.poll()
-                print(f"RTSP FFmpeg exited (code {exit_code}); restarting...")
-                stop_ffmpeg(ffmpeg_rtsp_proc)
-                ffmpeg_rtsp_proc = None
-            if ffmpeg_rtsp_proc is None:
-                ffmpeg_rtsp_proc = start_ffmpeg_rtsp(
-                    target_width, target_height, target_fps
-                )
+    # expected_frame_size always follows the incoming size, so the only
+    # mismatch left is an odd width/height; trim it with a view instead of
+    # resampling the whole frame
+    if (w, h) != size:
+        frame = frame[: size[1], : size[0]]
+
+    # Convert to I420 once (1.5 bytes/pixel vs 3 for BGR24). The buffer is
+    # fresh per frame and only read afterwards, so both writer threads can
+    # share it without copying.
+    yuv = cv2.cvtColor(frame, cv2.COLOR_BGR2YUV_I420)
+    frame_view = memoryview(yuv).cast("B")
 
-        # If the current frame size differs from the expected size, resize once for both outputs
-        if (w, h) != expected_frame_size:
-            frame = cv2.resize(frame, expected_frame_size)
+    for sink in active_sinks:
+        sink.submit(frame_view, size, target_fps)
 
-        frame_bytes = frame.tobytes()
+    return True
 
-        def _write(
-            proc: Optional[subprocess.Popen], label: str, starter
-        ) -> Optional[subprocess.Popen]:
-            if proc is None:
-                return None
+
+def start_encoder() -> None:
+    """Start background thread that feeds submitted frames to FFmpeg."""
+    global encode_thread
+
+    def _encoder() -> None:
+        # Pinned only: the conversion work here is CPU-bound, so it must not
+        # run real-time
+        tune_current_thread("encoder", ENCODER_THREAD_CPUS)
+        while True:
+            frame = encode_queue.get()
+            if frame is None:
+                break
             try:
-                if proc.stdin:
-                    proc.stdin.write(frame_bytes)
-            except (BrokenPipeError, IOError) as err:
-                print(f"FFmpeg {label} pipe error ({err}); restarting...")
-                stop_ffmpeg(proc)
-                return starter(target_width, target_height, target_fps)
-            return proc
-
-        if ENABLE_RECORDING:
-            ffmpeg_record_proc = _write(
-                ffmpeg_record_proc, "recording", start_ffmpeg_record
-            )
-        if ENABLE_RTSP:
-            ffmpeg_rtsp_proc = _write(ffmpeg_rtsp_proc, "rtsp", start_ffmpeg_rtsp)
+                write_frame_to_ffmpeg(frame)
+            except Exception as e:
+                print(f"FFmpeg write error: {e}")
+
+    if encode_thread is None or not encode_thread.is_alive():
+        encode_thread = threading.Thread(target=_encoder, daemon=True)
+        encode_thread.start()
+        print("FFmpeg writer thread started")
 
-        return True
+
+def stop_encoder() -> None:
+    """Stop the FFmpeg writer thread, dropping any frame still queued."""
+    global encode_thread
+    if encode_thread is None:
+        return
+    _put_latest(encode_queue, None)
+    encode_thread.join(timeout=5)
+    encode_thread = None
+
+
+def submit_frame(frame: np.ndarray) -> None:
+    """Hand a frame to the FFmpeg writer thread without blocking the caller."""
+    if not active_sinks:
+        return
+    _put_latest(encode_queue, frame)
 
 
 def start_startup(force: bool = False) -> None:
@@ -575,7 +1179,7 @@ def apply_camera_adjustments() -> None:
             # Disable auto white balance
             try:
                 print("Disabling auto white balance (awb=0)")
-                resp = requests.get(
+                resp = get_esp_session().get(
                     "http://192.168.0.13/control?var=awb&val=0", timeout=2
                 )
                 if resp.status_code == 200:
@@ -588,7 +1192,7 @@ def apply_camera_adjustments() -> None:
             # Set auto exposure level
             try:
                 print("Setting auto exposure level (ae_level=2)")
-                resp = requests.get(
+                resp = get_esp_session().get(
                     "http://192.168.0.13/control?var=ae_level&val=2", timeout=2
                 )
                 if resp.status_code == 200:
@@ -601,7 +1205,7 @@ def apply_camera_adjustments() -> None:
             # Disable auto gain control
             try:
                 print("Disabling auto gain control (agc=0)")
-                resp = requests.get(
+                resp = get_esp_session().get(
                     "http://192.168.0.13/control?var=agc&val=0", timeout=2
                 )
                 if resp.status_code == 200:
@@ -653,7 +1257,9 @@ def start_memory_monitor() -> None:
         global memory_percent
         while True:
             try:
-                response = requests.get("http://192.168.0.13/syshealth", timeout=3.0)
+                response = get_esp_session().get(
+                    "http://192.168.0.13/syshealth", timeout=3.0
+                )
                 if response.status_code == 200:
                     data = response.json()
                     free_heap = data.get("freeHeap", 0)
@@ -685,18 +1291,14 @@ def start_memory_monitor() -> None:
 
 def update_fps() -> None:
     """Update FPS calculation based on frame timestamps."""
-    global fps_value, fps_frame_times
+    global fps_value
 
     current_time = time.time()
 
     with fps_lock:
-        # Add current frame time
+        # Add current frame time; the deque drops the oldest past N frames
         fps_frame_times.append(current_time)
 
-        # Keep only recent frames (last N frames)
-        if len(fps_frame_times) > FPS_SAMPLE_WINDOW:
-            fps_frame_times.pop(0)
-
         # Calculate FPS if we have enough samples
         if len(fps_frame_times) >= 2:
             time_span = fps_frame_times[-1] - fps_frame_times[0]
@@ -704,24 +1306,60 @@ def update_fps() -> None:
                 fps_value = (len(fps_frame_times) - 1) / time_span
 
 
+def hud_status() -> tuple[Optional[int], float, Optional[float]]:
+    """Snapshot (rssi, fps, memory %) for the HUD.
+
+    Each value is one module global rebound by its updater, and reading a
+    global is atomic under the GIL, so the per-frame readers take no locks.
+    """
+    return rssi_value, fps_value, memory_percent
+
+
+@functools.lru_cache(maxsize=64)
+def _box_fill(h: int, w: int, color: tuple) -> np.ndarray:
+    """Solid BGR tile for draw_box; HUD boxes keep the same sizes and colors."""
+    tile = np.empty((h, w, 3), dtype=np.uint8)
+    tile[:] = color
+    tile.flags.writeable = False
+    return tile
+
+
 def draw_box(frame, x, y, w, h, bg_color=(10, 10, 10), alpha=0.85):
     """Draws a semi-transparent background box."""
-    overlay = frame.copy()
-    cv2.rectangle(overlay, (x, y), (x + w, y + h), bg_color, -1)
-    cv2.addWeighted(overlay, alpha, frame, 1 - alpha, 0, frame)
+    # Blend only the box region instead of copying and blending the whole
+    # frame; the filled rectangle spans (x, y) to (x + w, y + h) inclusive.
+    fh, fw = frame.shape[:2]
+    x0, y0 = max(x, 0), max(y, 0)
+    x1, y1 = min(x + w + 1, fw), min(y + h + 1, fh)
+    if x0 >= x1 or y0 >= y1:
+        return
+    roi = frame[y0:y1, x0:x1]
+    fill = _box_fill(y1 - y0, x1 - x0, tuple(bg_color))
+    cv2.addWeighted(fill, alpha, roi, 1 - alpha, 0, dst=roi)
 
 
-def draw_wifi_icon(frame, x, y, size, rssi, color):
-    """Draws a WiFi signal icon using arcs."""
-    # center is bottom-middle of the icon area
-    cx, cy = x + size // 2, y + size - 4
+def _render_wifi_icon(img, cx, cy, size, bars, color):
+    """Rasterize the WiFi icon (dot + three arcs) centred at (cx, cy)."""
     radius_step = size // 3
     thickness = 2
 
     # Dot
-    cv2.circle(frame, (cx, cy), 2, color, -1)
+    cv2.circle(img, (cx, cy), 2, color, -1)
 
-    # Arcs
+    # Draw background (dim) arcs
+    grey = (60, 60, 60)
+
+    for i in range(1, 4):
+        r = i * radius_step
+        curr_color = color if i <= bars else grey
+        # StartAngle 225, EndAngle 315 for a top-up wedge look
+        cv2.ellipse(
+            img, (cx, cy), (r, r), 0, 225, 315, curr_color, thickness, cv2.LINE_AA
+        )
+
+
+def _wifi_bars(rssi):
+    """Number of lit WiFi arcs for an RSSI reading."""
     # Logic: > -60: 3 arcs, > -70: 2 arcs, > -80: 1 arc
     bars = 0
     if rssi is not None:
@@ -731,19 +1369,24 @@ def draw_wifi_icon(frame, x, y, size, rssi, color):
             bars = 2
         elif rssi >= -80:
             bars = 1
+    return bars
 
-    # Draw background (dim) arcs
-    grey = (60, 60, 60)
 
-    for i in range(1, 4):
-        r = i * radius_step
-        curr_color = color if i <= bars else grey
-        # StartAngle 225, EndAngle 315 for a top-up wedge look
-        cv2.ellipse(
-            frame, (cx, cy), (r, r), 0, 225, 315, curr_color, thickness, cv2.LINE_AA
-        )
+def blit_sprite(frame, sprite, keep, x0, y0):
+    """Blend a pre-rendered (premultiplied BGR, 255 * (1 - alpha)) sprite.
 
-    return size
+    Both tiles are uint8; the sprite's top-left corner goes at (x0, y0).
+    """
+    sh, sw = keep.shape[:2]
+    fh, fw = frame.shape[:2]
+    fx0, fy0 = max(x0, 0), max(y0, 0)
+    fx1, fy1 = min(x0 + sw, fw), min(y0 + sh, fh)
+    if fx0 < fx1 and fy0 < fy1:
+        sl = (slice(fy0 - y0, fy1 - y0), slice(fx0 - x0, fx1 - x0))
+        roi = frame[fy0:fy1, fx0:fx1]
+        blended = cv2.multiply(roi, keep[sl], scale=1 / 255, dtype=cv2.CV_32F)
+        cv2.add(blended, sprite[sl], dst=blended, dtype=cv2.CV_32F)
+        cv2.convertScaleAbs(blended, dst=roi)  # rounds and saturates to uint8
 
 
 def get_status_color(value, thresholds, colors):
@@ -756,6 +1399,89 @@ def get_status_color(value, thresholds, colors):
     return colors[-1]
 
 
+HUD_FONT = cv2.FONT_HERSHEY_SIMPLEX
+HUD_FONT_SCALE = 0.55
+HUD_FONT_COLOR = (230, 230, 230)
+HUD_FONT_THICKNESS = 1
+
+
+@functools.lru_cache(maxsize=256)
+def hud_text_size(text: str) -> tuple[tuple[int, int], int]:
+    """Cached cv2.getTextSize for HUD labels; they repeat from frame to frame."""
+    return cv2.getTextSize(text, HUD_FONT, HUD_FONT_SCALE, HUD_FONT_THICKNESS)
+
+
+HUD_BOX_H = 36
+HUD_PAD_X = 12
+HUD_BOX_COLOR = (10, 10, 10)
+HUD_BOX_ALPHA = 0.85
+
+
+def _render_badge(img, kind, text, text_dy, color, value):
+    """Draw one HUD badge's contents with the badge's top-left corner at (0, 0)."""
+    pad_x = HUD_PAD_X
+    text_x = pad_x
+    if kind == "wifi":
+        icon_size = 20
+        # centre is bottom-middle of the icon area
+        cx, cy = pad_x + icon_size // 2, 6 + icon_size - 4
+        _render_wifi_icon(img, cx, cy, icon_size, _wifi_bars(value), color)
+        text_x = pad_x + icon_size + 8
+        color = HUD_FONT_COLOR
+    elif kind == "fps":
+        cv2.circle(img, (pad_x + 2, HUD_BOX_H // 2), 3, color, -1)
+        text_x = pad_x + 10
+        color = HUD_FONT_COLOR
+    elif kind == "memory":
+        # Icon (Simple Chip)
+        icon_w = 12
+        ic_x, ic_y = pad_x, 10
+        cv2.rectangle(img, (ic_x, ic_y), (ic_x + icon_w, ic_y + 14), color, 1)
+        # Pins
+        cv2.line(img, (ic_x + 2, ic_y + 3), (ic_x + icon_w - 2, ic_y + 3), color, 1)
+        cv2.line(img, (ic_x + 2, ic_y + 10), (ic_x + icon_w - 2, ic_y + 10), color, 1)
+        text_x = pad_x + icon_w + 6
+        color = HUD_FONT_COLOR
+
+    cv2.putText(
+        img,
+        text,
+        (text_x, text_dy),
+        HUD_FONT,
+        HUD_FONT_SCALE,
+        color,
+        HUD_FONT_THICKNESS,
+        cv2.LINE_AA,
+    )
+
+
+@functools.lru_cache(maxsize=64)
+def _hud_badge_sprite(
+    kind,
+    text,
+    box_w,
+    text_dy,
+    color,
+    value,
+    bg_color=HUD_BOX_COLOR,
+    alpha=HUD_BOX_ALPHA,
+):
+    """Pre-rendered HUD badge (box and contents) as a blit_sprite uint8 tile pair.
+
+    Drawn on black and on white, so one blend per badge reproduces the box,
+    icon and text drawn straight onto the frame. Only for badges that change
+    with their readings; the timestamp is drawn directly.
+    """
+    tiles = []
+    for bg in (0, 255):
+        tile = np.full((HUD_BOX_H + 1, box_w + 1, 3), bg, dtype=np.uint8)
+        draw_box(tile, 0, 0, box_w, HUD_BOX_H, bg_color, alpha)
+        _render_badge(tile, kind, text, text_dy, color, value)
+        tiles.append(tile)
+    on_black, on_white = tiles
+    return on_black, cv2.subtract(on_white, on_black)
+
+
 def draw_hud(
     frame: np.ndarray,
     fps: float,
@@ -770,20 +1496,16 @@ def draw_hud(
     h, w = frame.shape[:2]
     # Configuration
     top_margin = 15
-    box_h = 36
-    pad_x = 12
+    box_h = HUD_BOX_H
+    pad_x = HUD_PAD_X
     gap = 10
 
-    font = cv2.FONT_HERSHEY_SIMPLEX
-    font_scale = 0.55  # Increased slightly
-    font_color = (230, 230, 230)
-    thickness = 1
     # --- 1. Timestamp (Top Left) ---
-    ts = datetime.now(IST).strftime("%Y-%m-%d %I:%M:%S %p")
-    (tw, th), baseline = cv2.getTextSize(ts, font, font_scale, thickness)
+    ts = hud_timestamp()
+    (tw, th), baseline = hud_text_size(ts)
     ts_box_w = tw + (pad_x * 2)
 
-    text_y = top_margin + (box_h + th) // 2 - 2
+    text_dy = (box_h + th) // 2 - 2
     overlap_pad = 4
 
     def overlaps_box(box_x: int, box_y: int, box_w: int, box_h: int) -> bool:
@@ -800,44 +1522,35 @@ def draw_hud(
             return False
         return not HUD_COOLDOWN.is_hidden(key, now)
 
+    def draw_badge(box_x: int, sprite: tuple) -> None:
+        blit_sprite(frame, sprite[0], sprite[1], box_x, top_margin)
+
     if should_draw("timestamp", gap, top_margin, ts_box_w, box_h):
-        draw_box(frame, gap, top_margin, ts_box_w, box_h)
-        cv2.putText(
-            frame,
-            ts,
-            (gap + pad_x, text_y),
-            font,
-            font_scale,
-            font_color,
-            thickness,
-            cv2.LINE_AA,
+        # New text every second, so a cached sprite would never be reused
+        draw_box(frame, gap, top_margin, ts_box_w, box_h, HUD_BOX_COLOR, HUD_BOX_ALPHA)
+        _render_badge(
+            frame[top_margin:, gap:], "text", ts, text_dy, HUD_FONT_COLOR, None
         )
 
     # --- 2. Motion Warning (Next to Timestamp) ---
     if motion_detected:
         warn_text = "MOTION DETECTED"
-        (tw, th), _ = cv2.getTextSize(warn_text, font, font_scale, thickness)
+        (tw, th), _ = hud_text_size(warn_text)
         warn_box_w = tw + (pad_x * 2)
         warn_x = gap + ts_box_w + gap
         if should_draw("motion_warn", warn_x, top_margin, warn_box_w, box_h):
-            draw_box(
-                frame,
+            draw_badge(
                 warn_x,
-                top_margin,
-                warn_box_w,
-                box_h,
-                bg_color=(180, 40, 40),
-                alpha=0.9,
-            )
-            cv2.putText(
-                frame,
-                warn_text,
-                (warn_x + pad_x, text_y),
-                font,
-                font_scale,
-                (255, 255, 255),
-                thickness,
-                cv2.LINE_AA,
+                _hud_badge_sprite(
+                    "text",
+                    warn_text,
+                    warn_box_w,
+                    text_dy,
+                    (255, 255, 255),
+                    None,
+                    bg_color=(180, 40, 40),
+                    alpha=0.9,
+                ),
             )
 
     # --- 3. Status Widgets (Top Right - Flowing Left) ---
@@ -845,7 +1558,7 @@ def draw_hud(
 
     # -- WiFi Box --
     wifi_text = f"{rssi}dBm" if rssi is not None else "--dBm"
-    (tw, th), _ = cv2.getTextSize(wifi_text, font, font_scale, thickness)
+    (tw, th), _ = hud_text_size(wifi_text)
 
     icon_size = 20
     icon_pad = 8
@@ -853,29 +1566,14 @@ def draw_hud(
 
     cursor_x -= wifi_box_w
     if should_draw("wifi", cursor_x, top_margin, wifi_box_w, box_h):
-        draw_box(frame, cursor_x, top_margin, wifi_box_w, box_h)
-
-        # Draw content
         wifi_color = get_status_color(
             rssi,
             [-60, -70, -80],
             [(100, 255, 100), (0, 255, 255), (0, 165, 255), (50, 50, 255)],
         )
-
-        # Icon
-        icon_x = cursor_x + pad_x
-        draw_wifi_icon(frame, icon_x, top_margin + 6, icon_size, rssi, wifi_color)
-
-        # Text
-        cv2.putText(
-            frame,
-            wifi_text,
-            (icon_x + icon_size + icon_pad, text_y),
-            font,
-            font_scale,
-            font_color,
-            thickness,
-            cv2.LINE_AA,
+        draw_badge(
+            cursor_x,
+            _hud_badge_sprite("wifi", wifi_text, wifi_box_w, text_dy, wifi_color, rssi),
         )
 
     cursor_x -= gap
@@ -883,33 +1581,18 @@ def draw_hud(
     # -- FPS Box --
     fps_val = int(fps)
     fps_str = f"{fps_val} fps"
-    (tw, th), _ = cv2.getTextSize(fps_str, font, font_scale, thickness)
+    (tw, th), _ = hud_text_size(fps_str)
 
     fps_box_w = tw + (pad_x * 2) + 6  # +6 for dot space
     cursor_x -= fps_box_w
     if should_draw("fps", cursor_x, top_margin, fps_box_w, box_h):
-        draw_box(frame, cursor_x, top_margin, fps_box_w, box_h)
-
         # Color logic: >= 7 Green, >= 5 Yellow, else Red
         fps_color = get_status_color(
             fps, [7, 5], [(100, 255, 100), (0, 255, 255), (50, 50, 255)]
         )
-
-        # Dot
-        dot_x = cursor_x + pad_x
-        dot_y = top_margin + box_h // 2
-        cv2.circle(frame, (dot_x + 2, dot_y), 3, fps_color, -1)
-
-        # Text
-        cv2.putText(
-            frame,
-            fps_str,
-            (dot_x + 10, text_y),
-            font,
-            font_scale,
-            font_color,
-            thickness,
-            cv2.LINE_AA,
+        draw_badge(
+            cursor_x,
+            _hud_badge_sprite("fps", fps_str, fps_box_w, text_dy, fps_color, None),
         )
 
     cursor_x -= gap
@@ -917,7 +1600,7 @@ def draw_hud(
     # -- Memory Box (if enabled) --
     if SHOW_MEMORY_BADGE:
         mem_val = f"{int(mem_pct)}%" if mem_pct is not None else "--%"
-        (tw, th), _ = cv2.getTextSize(mem_val, font, font_scale, thickness)
+        (tw, th), _ = hud_text_size(mem_val)
 
         icon_w = 12
         icon_pad = 6
@@ -925,38 +1608,14 @@ def draw_hud(
 
         cursor_x -= mem_box_w
         if should_draw("memory", cursor_x, top_margin, mem_box_w, box_h):
-            draw_box(frame, cursor_x, top_margin, mem_box_w, box_h)
-
             mem_color = get_status_color(
                 mem_pct, [20, 10], [(220, 220, 220), (0, 255, 255), (50, 50, 255)]
             )
-
-            # Icon (Simple Chip)
-            ic_x = cursor_x + pad_x
-            ic_y = top_margin + 10
-            cv2.rectangle(frame, (ic_x, ic_y), (ic_x + icon_w, ic_y + 14), mem_color, 1)
-            # Pins
-            cv2.line(
-                frame, (ic_x + 2, ic_y + 3), (ic_x + icon_w - 2, ic_y + 3), mem_color, 1
-            )
-            cv2.line(
-                frame,
-                (ic_x + 2, ic_y + 10),
-                (ic_x + icon_w - 2, ic_y + 10),
-                mem_color,
-                1,
-            )
-
-            # Text
-            cv2.putText(
-                frame,
-                mem_val,
-                (ic_x + icon_w + icon_pad, text_y),
-                font,
-                font_scale,
-                font_color,
-                thickness,
-                cv2.LINE_AA,
+            draw_badge(
+                cursor_x,
+                _hud_badge_sprite(
+                    "memory", mem_val, mem_box_w, text_dy, mem_color, None
+                ),
             )
 
         cursor_x -= gap
@@ -966,9 +1625,19 @@ def backoff(attempt: int) -> float:
     return min(5.0, 0.5 * (2**attempt))
 
 
+# Last rendered local-view placeholder/no-signal frame and the inputs it was
+# drawn from; the HUD only changes once a second or when a reading changes
+_no_signal_display_cache: dict = {"key": None, "frame": None}
+
+
 def show_placeholder(message: str) -> None:
     if not SHOW_LOCAL_VIEW:
         return  # Don't show placeholder if local view is disabled
+    key = ("placeholder", message, int(time.time()))
+    if key == _no_signal_display_cache["key"]:
+        cv2.imshow("frame", _no_signal_display_cache["frame"])
+        return
+
     base = (
         no_signal_img
         if no_signal_img is not None
@@ -991,11 +1660,34 @@ def show_placeholder(message: str) -> None:
     # Use draw_hud with placeholders
     draw_hud(frame, fps=0, rssi=None, mem_pct=None)
 
+    _no_signal_display_cache["key"] = key
+    _no_signal_display_cache["frame"] = frame
     cv2.imshow("frame", frame)
 
 
 def show_no_signal_frame(message: str) -> Optional[np.ndarray]:
-    """Create and optionally display a no-signal frame. Always returns the frame for recording."""
+    """Create and optionally display a no-signal frame. Always returns the frame for recording.
+
+    The previous frame is reused while the message, HUD values and displayed
+    second are unchanged; it is never modified once returned.
+    """
+    # Get current status values
+    current_rssi, current_fps, current_memory = hud_status()
+
+    key = (
+        "no_signal",
+        message,
+        int(time.time()),
+        int(current_fps),
+        current_rssi,
+        None if current_memory is None else int(current_memory),
+    )
+    if key == _no_signal_display_cache["key"]:
+        frame = _no_signal_display_cache["frame"]
+        if SHOW_LOCAL_VIEW:
+            cv2.imshow("frame", frame)
+        return frame
+
     # Initialize frame from no_signal_img
     if no_signal_img is not None:
         frame = no_signal_img.copy()
@@ -1024,17 +1716,12 @@ def show_no_signal_frame(message: str) -> Optional[np.ndarray]:
         cv2.LINE_AA,
     )
 
-    # Get current status values
-    with rssi_lock:
-        current_rssi = rssi_value
-    with fps_lock:
-        current_fps = fps_value
-    with memory_lock:
-        current_memory = memory_percent
-
     # Draw HUD
     draw_hud(frame, current_fps, current_rssi, current_memory)
 
+    _no_signal_display_cache["key"] = key
+    _no_signal_display_cache["frame"] = frame
+
     # Show in window if enabled
     if SHOW_LOCAL_VIEW:
         cv2.imshow("frame", frame)
@@ -1042,25 +1729,52 @@ def show_no_signal_frame(message: str) -> Optional[np.ndarray]:
     return frame
 
 
-def get_no_signal_frame_for_size(width: int, height: int, message: str) -> np.ndarray:
-    """Create a no-signal frame matching the specified dimensions for FFmpeg."""
-    # Create or resize no_signal base to match camera dimensions
+@functools.lru_cache(maxsize=4)
+def _no_signal_base(width: int, height: int) -> np.ndarray:
+    """Return the no-signal image at the given size (shared; never draw on it)."""
     if no_signal_img is not None:
-        base = cv2.resize(no_signal_img, (width, height))
-    else:
-        base = np.zeros((height, width, 3), dtype=np.uint8)
-        cv2.putText(
-            base,
-            "NO SIGNAL",
-            (width // 4, height // 2),
-            cv2.FONT_HERSHEY_SIMPLEX,
-            1.4,
-            (0, 0, 255),
-            3,
-            cv2.LINE_AA,
-        )
+        return cv2.resize(no_signal_img, (width, height))
+    base = np.zeros((height, width, 3), dtype=np.uint8)
+    cv2.putText(
+        base,
+        "NO SIGNAL",
+        (width // 4, height // 2),
+        cv2.FONT_HERSHEY_SIMPLEX,
+        1.4,
+        (0, 0, 255),
+        3,
+        cv2.LINE_AA,
+    )
+    return base
 
-    frame = base.copy()
+
+# Last rendered encoder-sized no-signal frame and the inputs it was drawn from
+_no_signal_frame_cache: dict = {"key": None, "frame": None}
+
+
+def get_no_signal_frame_for_size(width: int, height: int, message: str) -> np.ndarray:
+    """Create a no-signal frame matching the specified dimensions for FFmpeg.
+
+    The frame only changes when the message, the HUD values, or the displayed
+    second change, so the previous frame is returned as-is in between. Frames
+    handed to the encoder are never modified afterwards.
+    """
+    # Get current status values
+    current_rssi, current_fps, current_memory = hud_status()
+
+    key = (
+        width,
+        height,
+        message,
+        int(time.time()),
+        int(current_fps),
+        current_rssi,
+        None if current_memory is None else int(current_memory),
+    )
+    if key == _no_signal_frame_cache["key"]:
+        return _no_signal_frame_cache["frame"]
+
+    frame = _no_signal_base(width, height).copy()
 
     # Draw message
     cv2.putText(
@@ -1074,40 +1788,37 @@ def get_no_signal_frame_for_size(width: int, height: int, message: str) -> np.nd
         cv2.LINE_AA,
     )
 
-    # Get current status values
-    with rssi_lock:
-        current_rssi = rssi_value
-    with fps_lock:
-        current_fps = fps_value
-    with memory_lock:
-        current_memory = memory_percent
-
     # Draw HUD
     draw_hud(frame, current_fps, current_rssi, current_memory)
 
+    _no_signal_frame_cache["key"] = key
+    _no_signal_frame_cache["frame"] = frame
     return frame
 
 
 def record_no_signal_frame(message: str) -> None:
     """Show (if requested) and record a no-signal frame sized for the encoder."""
-    display_frame = show_no_signal_frame(message)
-
-    if not ENABLE_RECORDING:
-        return
-
-    if expected_frame_size:
+    frame_for_record = None
+    if active_sinks and expected_frame_size:
         frame_for_record = get_no_signal_frame_for_size(
             expected_frame_size[0], expected_frame_size[1], message
         )
-    else:
-        frame_for_record = display_frame
 
     if frame_for_record is not None:
-        write_frame_to_ffmpeg(frame_for_record)
+        # The window shows live frames at the stream size too, so show the
+        # frame being recorded instead of drawing the HUD a second time
+        if SHOW_LOCAL_VIEW:
+            cv2.imshow("frame", frame_for_record)
+    elif SHOW_LOCAL_VIEW or active_sinks:
+        # Only render the full-size display frame when something will use it
+        frame_for_record = show_no_signal_frame(message)
+
+    if active_sinks and frame_for_record is not None:
+        submit_frame(frame_for_record)
 
 
-def _open_capture_thread():
-    """Open capture in background thread."""
+def _open_capture_thread(result: dict, done: threading.Event):
+    """Open capture in background thread and signal `done` when finished."""
     try:
         cap = cv2.VideoCapture(URL, cv2.CAP_FFMPEG)
         if hasattr(cv2, "CAP_PROP_BUFFERSIZE"):
@@ -1115,37 +1826,30 @@ def _open_capture_thread():
         if hasattr(cv2, "CAP_PROP_OPEN_TIMEOUT_MSEC"):
             cap.set(cv2.CAP_PROP_OPEN_TIMEOUT_MSEC, 5000)
         if hasattr(cv2, "CAP_PROP_READ_TIMEOUT_MSEC"):
-            cap.set(cv2.CAP_PROP_READ_TIMEOUT_MSEC, 5000)
-
-        with capture_lock:
-            capture_result["cap"] = cap
-            capture_result["done"] = True
+            # Bounds how long an abandoned FrameReader can stay blocked in read()
+            cap.set(cv2.CAP_PROP_READ_TIMEOUT_MSEC, int(FRAME_READ_TIMEOUT * 1000))
+        result["cap"] = cap
     except Exception as e:
         print(f"Exception opening capture: {e}")
-        with capture_lock:
-            capture_result["cap"] = None
-            capture_result["done"] = True
+    finally:
+        done.set()
 
 
 def open_capture_with_timeout() -> Optional[cv2.VideoCapture]:
     """Open capture with timeout - if it takes too long, abort."""
-    global capture_result
-
-    # Reset state
-    with capture_lock:
-        capture_result = {"cap": None, "done": False}
+    # Fresh state per attempt so an abandoned opener can't leak into a later one
+    result: dict = {"cap": None}
+    done = threading.Event()
 
     # Start opening in background
-    thread = threading.Thread(target=_open_capture_thread, daemon=True)
+    thread = threading.Thread(
+        target=_open_capture_thread, args=(result, done), daemon=True
+    )
     thread.start()
 
-    # Wait with timeout
-    start_time = time.time()
-    while time.time() - start_time < CAPTURE_OPEN_TIMEOUT:
-        with capture_lock:
-            if capture_result["done"]:
-                return capture_result["cap"]
-        time.sleep(0.1)
+    # Wakes as soon as the opener finishes instead of polling
+    if done.wait(CAPTURE_OPEN_TIMEOUT):
+        return result["cap"]
 
     # Timeout - abandon the thread and return None
     print(f"Capture open timed out after {CAPTURE_OPEN_TIMEOUT}s")
@@ -1153,26 +1857,15 @@ def open_capture_with_timeout() -> Optional[cv2.VideoCapture]:
 
 
 def main() -> None:
-    global ffmpeg_record_proc, ffmpeg_rtsp_proc, expected_frame_size, current_fps, camera_adjustments_done
+    global expected_frame_size, current_fps, camera_adjustments_done
     attempt = 0
-    cap = None
+    reader: Optional[FrameReader] = None
+    display_buf: Optional[np.ndarray] = None
 
     # Initialize motion detection components
-    mog2 = cv2.createBackgroundSubtractorMOG2(
-        history=500, varThreshold=25, detectShadows=True
-    )
-    kernel = cv2.getStructuringElement(cv2.MORPH_RECT, (3, 3))
+    detector = MotionDetector() if ENABLE_MOTION else None
     blinker = NonBlockingBlinker(blink_interval=0.5)
 
-    # Ensure SIGALRM interrupts blocking frame reads after FRAME_READ_TIMEOUT seconds.
-    class FrameReadTimeout(Exception):
-        pass
-
-    def _timeout_handler(_signum, _frame):
-        raise FrameReadTimeout()
-
-    signal.signal(signal.SIGALRM, _timeout_handler)
-
     print("Starting camera initialization in background...")
     if ENABLE_RECORDING:
         print(f"Recording enabled: {BASE_DIR}")
@@ -1184,6 +1877,10 @@ def main() -> None:
             print(
                 f"Segment duration: {SEGMENT_SECONDS}s, FPS: {FIXED_OUTPUT_FPS:.0f} (fixed)"
             )
+    if active_sinks:
+        # Probe the encoder up front so the first frame write doesn't stall on it
+        get_video_encoder()
+        start_encoder()
     if not SHOW_LOCAL_VIEW:
         print("Local view disabled - running in headless mode")
         print("Press Ctrl+C to stop")
@@ -1197,18 +1894,16 @@ def main() -> None:
 
     try:
         while True:
-            # Only check for 'q' key if showing local view
+            # Only check for 'q' key if showing local view. Headless, the loop
+            # is paced by the blocking reader.read() and the retry sleeps below.
             if SHOW_LOCAL_VIEW:
                 if cv2.waitKey(1) == ord("q"):
                     break
-            else:
-                # Small sleep to prevent tight loop when not showing view
-                time.sleep(0.01)
 
             if not startup_complete.is_set():
-                if cap is not None:
-                    cap.release()
-                    cap = None
+                if reader is not None:
+                    reader.stop()
+                    reader = None
 
                 # Show and record "no signal" frame during initialization
                 # RSSI/Memory monitors are running, showing actual camera health
@@ -1217,10 +1912,7 @@ def main() -> None:
                 time.sleep(0.05)
                 continue
 
-            if cap is None or not cap.isOpened():
-                if cap is not None:
-                    cap.release()
-
+            if reader is None:
                 # Show and record "no signal" frame during connection attempts
                 # Startup is complete, but video stream not connected yet
                 record_no_signal_frame(f"STREAM: Connecting (attempt {attempt + 1})...")
@@ -1230,27 +1922,19 @@ def main() -> None:
                     print(f"Failed to open stream on attempt {attempt + 1}")
                     if cap is not None:
                         cap.release()
-                    cap = None
                     attempt += 1
                     time.sleep(backoff(attempt))
                     start_startup(force=True)
                     continue
                 print("Connection established.")
                 attempt = 0
+                reader = FrameReader(cap)
 
-            try:
-                signal.setitimer(signal.ITIMER_REAL, FRAME_READ_TIMEOUT)
-                ret, frame = cap.read()
-            except FrameReadTimeout:
-                print("Frame read timed out - forcing restart.")
-                ret, frame = False, None
-            finally:
-                signal.setitimer(signal.ITIMER_REAL, 0)
-
-            if not ret or frame is None:
+            frame = reader.read(FRAME_READ_TIMEOUT)
+            if frame is None:
                 print("Frame read failed - signal lost.")
-                cap.release()
-                cap = None
+                reader.stop()
+                reader = None
                 start_startup(force=True)
 
                 # Show and record "no signal" frame
@@ -1269,52 +1953,20 @@ def main() -> None:
             # Update FPS calculation
             update_fps()
 
-            # Motion detection on the current frame
-            fg_mask = mog2.apply(frame)
-            _, mask = cv2.threshold(fg_mask, 200, 255, cv2.THRESH_BINARY)
-            mask = cv2.morphologyEx(mask, cv2.MORPH_OPEN, kernel)
-            mask = cv2.dilate(mask, kernel, iterations=2)
-
-            # Build ROI mask and apply
-            roi_mask = np.zeros_like(mask, dtype=np.uint8)
-            cv2.fillPoly(roi_mask, [ROI_PTS], 255)
-            filtered_motion = cv2.bitwise_and(mask, roi_mask)
-
-            # Find contours in filtered motion
-            contours, _ = cv2.findContours(
-                filtered_motion, cv2.RETR_EXTERNAL, cv2.CHAIN_APPROX_SIMPLE
-            )
-            disp = frame.copy()
+            # Motion detection on the current frame. The detector works on its
+            # own downscaled copy, so the overlays below may draw on `frame`.
+            boxes = detector.detect(frame) if detector is not None else []
             motion_detected = False
             time_overlap = False
             coordinates = [0, 0]
-            for c in contours:
-                area = cv2.contourArea(c)
-                if area < MIN_AREA:
-                    continue
+            tx0, ty0, tx1, ty1 = TIME_OVERLAP_ZONE
+            for x, y, w, h, area in boxes:
                 motion_detected = True
-                x, y, w, h = cv2.boundingRect(c)
                 coordinates = [x, y]
-                if 10 <= x <= 46 and 15 <= y <= 276:
+                if tx0 <= x <= tx1 and ty0 <= y <= ty1:
                     time_overlap = True
                     print("time_overlap")
 
-                # Only draw motion boxes if flag is enabled
-                if SHOW_MOTION_BOXES:
-                    cv2.rectangle(disp, (x, y), (x + w, y + h), (0, 255, 255), 2)
-                    cx, cy = x + w // 2, y + h // 2
-                    cv2.circle(disp, (cx, cy), 3, (0, 255, 255), -1)
-                    cv2.putText(
-                        disp,
-                        f"motion {area:.0f}",
-                        (x, max(0, y - 6)),
-                        cv2.FONT_HERSHEY_SIMPLEX,
-                        0.6,
-                        (0, 255, 255),
-                        2,
-                        cv2.LINE_AA,
-                    )
-
             # Drive non-blocking blinker on motion
             if motion_detected:
                 if not blinker.is_active:
@@ -1331,56 +1983,86 @@ def main() -> None:
                 print(f"Warning: Blinker update failed (camera may be crashed): {e}")
                 start_startup(force=True)
 
-            # Draw HUD (Timestamp, Status Badges, Motion Warning)
-            with rssi_lock:
-                current_rssi = rssi_value
-            with fps_lock:
-                current_fps = fps_value
-            with memory_lock:
-                current_memory = memory_percent
-
-            draw_hud(
-                disp,
-                current_fps,
-                current_rssi,
-                current_memory,
-                motion_detected,
-                time_overlap,
-                coordinates,
-            )
+            # Draw HUD (Timestamp, Status Badges, Motion Warning) and the
+            # motion overlays. Without RECORD_OVERLAY they go on a
+            # display-only copy, or are skipped entirely when nobody is
+            # watching.
+            if RECORD_OVERLAY:
+                hud_frame = frame
+            elif SHOW_LOCAL_VIEW:
+                # Display-only and consumed before the next frame, so one
+                # buffer is reused instead of allocating a copy per frame
+                if display_buf is None or display_buf.shape != frame.shape:
+                    display_buf = np.empty_like(frame)
+                np.copyto(display_buf, frame)
+                hud_frame = display_buf
+            else:
+                hud_frame = None
 
-            # Draw ROI polygon on display only if flag is enabled
-            if SHOW_MOTION_BOXES:
-                cv2.polylines(
-                    disp,
-                    [ROI_PTS],
-                    isClosed=True,
-                    color=(0, 255, 255),
-                    thickness=1,
-                    lineType=cv2.LINE_AA,
+            if hud_frame is not None:
+                # Only draw motion boxes if flag is enabled
+                if SHOW_MOTION_BOXES:
+                    for x, y, w, h, area in boxes:
+                        cv2.rectangle(
+                            hud_frame, (x, y), (x + w, y + h), (0, 255, 255), 2
+                        )
+                        cx, cy = x + w // 2, y + h // 2
+                        cv2.circle(hud_frame, (cx, cy), 3, (0, 255, 255), -1)
+                        cv2.putText(
+                            hud_frame,
+                            f"motion {area:.0f}",
+                            (x, max(0, y - 6)),
+                            cv2.FONT_HERSHEY_SIMPLEX,
+                            0.6,
+                            (0, 255, 255),
+                            2,
+                            cv2.LINE_AA,
+                        )
+
+                current_rssi, current_fps, current_memory = hud_status()
+
+                draw_hud(
+                    hud_frame,
+                    current_fps,
+                    current_rssi,
+                    current_memory,
+                    motion_detected,
+                    time_overlap,
+                    coordinates,
                 )
 
-            # Record frame with overlay (IN-PLACE recording with motion detection)
-            if ENABLE_RECORDING:
-                write_frame_to_ffmpeg(disp)
+                # Draw ROI polygon on display only if flag is enabled
+                if SHOW_MOTION_BOXES:
+                    cv2.polylines(
+                        hud_frame,
+                        [ROI_PTS],
+                        isClosed=True,
+                        color=(0, 255, 255),
+                        thickness=1,
+                        lineType=cv2.LINE_AA,
+                    )
+
+            # Record/stream frame with overlay (IN-PLACE with motion detection)
+            submit_frame(frame)
 
             # Display only if flag is enabled
             if SHOW_LOCAL_VIEW:
-                cv2.imshow("frame", disp)
-                cv2.imshow("ROI mask", roi_mask)
+                cv2.imshow("frame", hud_frame)
+                if detector is not None and detector.roi_mask is not None:
+                    cv2.imshow("ROI mask", detector.roi_mask)
 
     finally:
         # Cleanup
         print("\nShutting down...")
-        if cap is not None:
-            cap.release()
+        # Save the motion event still in progress, if any
+        acc.flush()
+        if reader is not None:
+            reader.stop()
+        stop_encoder()
         with ffmpeg_lock:
-            if ffmpeg_record_proc is not None:
-                stop_ffmpeg(ffmpeg_record_proc)
-                ffmpeg_record_proc = None
-            if ffmpeg_rtsp_proc is not None:
-                stop_ffmpeg(ffmpeg_rtsp_proc)
-                ffmpeg_rtsp_proc = None
+            record_sink.stop()
+            rtsp_sink.stop()
+            tee_sink.stop()
             expected_frame_size = None
         cv2.destroyAllWindows()
         print("Cleanup complete.")
@@ -1,6 +1,6 @@
 import cv2
 from datetime import datetime
-import pytz
+from zoneinfo import ZoneInfo
 
 URL = "http://192.168.0.13:81/stream"
 cap = cv2.VideoCapture(URL)
@@ -8,7 +8,7 @@ cap = cv2.VideoCapture(URL)
 if not cap.isOpened():
     raise RuntimeError("Could Not Open Stream")
 
-ist = pytz.timezone("Asia/Kolkata")
+ist = ZoneInfo("Asia/Kolkata")
 
 
 clicked_points = []
@@ -1,7 +1,6 @@
 import cv2
 import time
 from datetime import datetime, timezone, timedelta
-import pytz
 
 URL = "http://192.168.0.13:81/stream"
 
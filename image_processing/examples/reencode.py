@@ -1,6 +1,6 @@
 import cv2
 from datetime import datetime
-import pytz
+from zoneinfo import ZoneInfo
 import subprocess
 import threading
 import queue
@@ -14,11 +14,12 @@ if not cap.isOpened():
 
 cap.set(cv2.CAP_PROP_BUFFERSIZE, 1)
 
-width = int(cap.get(cv2.CAP_PROP_FRAME_WIDTH))
-height = int(cap.get(cv2.CAP_PROP_FRAME_HEIGHT))
+# 4:2:0 chroma subsampling needs even dimensions
+width = int(cap.get(cv2.CAP_PROP_FRAME_WIDTH)) & ~1
+height = int(cap.get(cv2.CAP_PROP_FRAME_HEIGHT)) & ~1
 fps = 10  # Force 10 FPS
 
-ist = pytz.timezone("Asia/Kolkata")
+ist = ZoneInfo("Asia/Kolkata")
 clicked_points = []
 running = True
 
@@ -43,15 +44,13 @@ ffmpeg_cmd = [
     "-vcodec",
     "rawvideo",
     "-pix_fmt",
-    "bgr24",
+    "yuv420p",  # I420 from Python: half the bytes of bgr24
     "-s",
     f"{width}x{height}",
     "-r",
     str(fps),
     "-i",
     "-",
-    "-vf",
-    "format=yuv420p",
     "-c:v",
     "libx264",
     "-preset",
@@ -127,6 +126,7 @@ def frame_processor():
     global running
     frame_count = 0
     start_time = time.time()
+    ts_sec, formatted_time = -1, ""  # timestamp text, re-formatted once per second
 
     while running:
         try:
@@ -138,8 +138,12 @@ def frame_processor():
         for point in clicked_points:
             cv2.circle(frame, point, 5, (0, 255, 0), -1)
 
-        current_time = datetime.now(ist)
-        formatted_time = current_time.strftime("%Y-%m-%d %H:%M:%S %p")
+        now_sec = int(time.time())
+        if now_sec != ts_sec:
+            ts_sec = now_sec
+            formatted_time = datetime.fromtimestamp(now_sec, ist).strftime(
+                "%Y-%m-%d %H:%M:%S %p"
+            )
         cv2.putText(
             frame,
             formatted_time,
@@ -151,10 +155,14 @@ def frame_processor():
             cv2.LINE_AA,
         )
 
-        # Write to FFmpeg
+        # Convert to I420 once here so FFmpeg skips its own conversion, then
+        # write straight from that buffer (no bytes copy); stdin is
+        # unbuffered, so keep writing until the whole frame is in the pipe
         try:
-            ffmpeg_process.stdin.write(frame.tobytes())  # type: ignore
-            ffmpeg_process.stdin.flush()  # type: ignore
+            yuv = cv2.cvtColor(frame[:height, :width], cv2.COLOR_BGR2YUV_I420)
+            view = memoryview(yuv).cast("B")
+            while view:
+                view = view[ffmpeg_process.stdin.write(view) :]  # type: ignore
         except (BrokenPipeError, IOError):
             print("FFmpeg pipe broken")
             running = False
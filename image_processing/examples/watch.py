@@ -1,6 +1,6 @@
 import cv2
 from datetime import datetime
-import pytz
+from zoneinfo import ZoneInfo
 
 URL = "http://192.168.0.13:81/stream"
 
@@ -10,7 +10,7 @@ if not cap.isOpened():
     raise RuntimeError("Could Not Open Stream")
 
 
-ist = pytz.timezone("Asia/Kolkata")
+ist = ZoneInfo("Asia/Kolkata")
 while True:
     ret, frame = cap.read()
     if not ret:
@@ -1,12 +1,15 @@
 #!/usr/bin/env python3
 import cv2, time, threading, queue, subprocess, os
 import numpy as np
-from datetime import datetime
-import pytz
+
+try:
+    import fcntl
+except ImportError:  # not POSIX
+    fcntl = None
 
 # ====== CONFIG ======
 URL = "http://192.168.0.13:81/stream"
-IST = pytz.timezone("Asia/Kolkata")
+IST_OFFSET_SECONDS = 5 * 3600 + 30 * 60  # IST is a fixed offset, no DST
 
 # Output
 BASE_DIR = "/srv/cctv/esp_cam1"
@@ -15,7 +18,9 @@ BITRATE = "4M"
 RTSP_OUT = "rtsp://127.0.0.1:8554/esp_cam1_overlay"
 
 # Motion
-MIN_AREA = 800
+MIN_AREA = 800  # in full-resolution pixels
+MOTION_SCALE = 2  # detect on the ROI crop shrunk by this factor per side
+MOTION_STRIDE = 3  # detect on 1 of every N frames, reuse the result between
 ROI_PTS = np.array(
     [
         [147, 400],
@@ -82,21 +87,38 @@ ROI_PTS = np.array(
 )
 
 SHOW_PREVIEW = True  # press q to quit
-TARGET_FPS = 10  # encode at ~10 fps
+TARGET_FPS = 10  # FFmpeg resamples to ~10 fps output
 FRAME_QUEUE_MAX = 2  # keep latency low
+F_SETPIPE_SZ = 1031  # Linux fcntl command for pipe capacity
 # ====================
 
 os.makedirs(BASE_DIR, exist_ok=True)
 
 # ---- Motion/overlay helpers ----
+# history counts analysed frames, so scale it to keep the same time span
 mog2 = cv2.createBackgroundSubtractorMOG2(
-    history=500, varThreshold=25, detectShadows=True
+    history=500 // MOTION_STRIDE, varThreshold=25, detectShadows=True
 )
 
 
+_ts_cache = {"sec": -1, "text": ""}
+
+
+def overlay_timestamp():
+    """IST timestamp string, formatted once per second rather than per frame."""
+    sec = int(time.time())
+    if sec != _ts_cache["sec"]:
+        # IST via shifted gmtime
+        _ts_cache["text"] = time.strftime(
+            "%Y-%m-%d %I:%M:%S %p", time.gmtime(sec + IST_OFFSET_SECONDS)
+        )
+        _ts_cache["sec"] = sec
+    return _ts_cache["text"]
+
+
 def draw_overlay(frame, motion_boxes, motion_flag):
     # timestamp
-    ts = datetime.now(IST).strftime("%Y-%m-%d %I:%M:%S %p")
+    ts = overlay_timestamp()
     txt = ts + ("  Motion" if motion_flag else "")
     cv2.putText(
         frame, txt, (10, 26), cv2.FONT_HERSHEY_SIMPLEX, 0.8, (0, 255, 0), 2, cv2.LINE_AA
@@ -124,26 +146,72 @@ def draw_overlay(frame, motion_boxes, motion_flag):
         )
 
 
+# open + double dilate, fused (see camera_pipeline.py)
+ERODE_KERNEL = cv2.getStructuringElement(cv2.MORPH_RECT, (3, 3))
+DILATE_KERNEL = cv2.getStructuringElement(cv2.MORPH_RECT, (7, 7))
+# At MOTION_SCALE the kernels grow blobs that many times further than at full
+# resolution (plus about one partly covered edge pixel); trimmed off each box
+# side so boxes and MIN_AREA mean what they do on the full-size frame
+MOTION_TRIM = (MOTION_SCALE - 1) * (7 - 3 + 1) / 2
+
+_roi_cache = {}
+# detect_motion's intermediate images, reused from frame to frame (OpenCV
+# reallocates one only if its size changes); only the processor thread uses them
+_motion_bufs = {"small": None, "gray": None, "fg": None}
+
+
+def get_roi(shape):
+    """Return (mask, (x, y, w, h)): the ROI bbox and its mask at MOTION_SCALE."""
+    key = shape[:2]
+    if key not in _roi_cache:
+        fh, fw = key
+        x, y, w, h = cv2.boundingRect(ROI_PTS)
+        x, y = max(x, 0), max(y, 0)
+        w, h = min(w, fw - x), min(h, fh - y)
+        mask = np.zeros((h // MOTION_SCALE, w // MOTION_SCALE), dtype=np.uint8)
+        pts = np.round((ROI_PTS - (x, y)) / MOTION_SCALE).astype(np.int32)
+        cv2.fillPoly(mask, [pts], 255)
+        _roi_cache[key] = (mask, (x, y, w, h))
+    return _roi_cache[key]
+
+
 def detect_motion(frame):
-    roi_mask = np.zeros(frame.shape[:2], dtype=np.uint8)
-    cv2.fillPoly(roi_mask, [ROI_PTS], 255)
-    gray = cv2.cvtColor(frame, cv2.COLOR_BGR2GRAY)
-    fg = mog2.apply(gray)
-    _, fg = cv2.threshold(fg, 200, 255, cv2.THRESH_BINARY)
-    fg = cv2.morphologyEx(fg, cv2.MORPH_OPEN, None)  # type: ignore
-    fg = cv2.dilate(fg, None, iterations=2)  # type: ignore
-    fg = cv2.bitwise_and(fg, fg, mask=roi_mask)
-    cnts, _ = cv2.findContours(fg, cv2.RETR_EXTERNAL, cv2.CHAIN_APPROX_SIMPLE)
-    boxes = []
-    motion = False
-    for c in cnts:
-        area = cv2.contourArea(c)
-        if area < MIN_AREA:
-            continue
-        x, y, w, h = cv2.boundingRect(c)
-        boxes.append((x, y, w, h, area))
-        motion = True
-    return motion, boxes
+    # Only the polygon's bounding box can contain motion, so run the whole
+    # chain on that crop, shrunk by MOTION_SCALE, and map the boxes back to
+    # full-frame coordinates.
+    roi_mask, (rx, ry, rw, rh) = get_roi(frame.shape)
+    crop = frame[ry : ry + rh, rx : rx + rw]
+    bufs = _motion_bufs
+    small = bufs["small"] = cv2.resize(
+        crop, roi_mask.shape[::-1], dst=bufs["small"], interpolation=cv2.INTER_AREA
+    )
+    gray = bufs["gray"] = cv2.cvtColor(small, cv2.COLOR_BGR2GRAY, dst=bufs["gray"])
+    fg = bufs["fg"] = mog2.apply(gray, fgmask=bufs["fg"])
+    # threshold -> open -> dilate x2, fused into erode + one dilate, in place
+    cv2.threshold(fg, 200, 255, cv2.THRESH_BINARY, dst=fg)
+    cv2.erode(fg, ERODE_KERNEL, dst=fg)
+    cv2.dilate(fg, DILATE_KERNEL, dst=fg)
+    cv2.bitwise_and(fg, roi_mask, dst=fg)
+    # nothing big enough to label
+    if cv2.countNonZero(fg) * (MOTION_SCALE * MOTION_SCALE) < MIN_AREA:
+        return False, []
+    _, _, stats, _ = cv2.connectedComponentsWithStats(fg, connectivity=8)
+    s, t = MOTION_SCALE, MOTION_TRIM
+    bx, by, bw, bh, ba = stats[1:].T.astype(np.float64)  # label 0 is the background
+    w = np.maximum(bw * s - 2 * t, 0)
+    h = np.maximum(bh * s - 2 * t, 0)
+    area = ba * (w * h) / (bw * bh)  # same fill ratio in the trimmed box
+    boxes = [
+        (
+            round(bx[i] * s + t) + rx,
+            round(by[i] * s + t) + ry,
+            round(w[i]),
+            round(h[i]),
+            round(area[i]),
+        )
+        for i in np.flatnonzero(area >= MIN_AREA)
+    ]
+    return bool(boxes), boxes
 
 
 # ---- FFmpeg launcher (tee: segment to disk + RTSP publish) ----
@@ -158,10 +226,13 @@ def start_ffmpeg(width, height, fps):
         "-nostdin",
         "-hide_banner",
         "-y",
+        # Stamp frames on arrival; the fps filter below does the pacing
+        "-use_wallclock_as_timestamps",
+        "1",
         "-f",
         "rawvideo",
         "-pix_fmt",
-        "bgr24",
+        "yuv420p",  # I420 from Python: half the bytes of bgr24
         "-s",
         f"{width}x{height}",
         "-r",
@@ -170,7 +241,7 @@ def start_ffmpeg(width, height, fps):
         "-",
         # Output 1: HIGH QUALITY for local recording
         "-vf",
-        "format=yuv420p",
+        f"fps={fps}",
         "-c:v",
         "libx264",
         "-preset",
@@ -196,7 +267,7 @@ def start_ffmpeg(width, height, fps):
         out_pattern,
         # Output 2: LOWER QUALITY/BITRATE for RTSP streaming
         "-vf",
-        "format=yuv420p",
+        f"fps={fps}",
         "-c:v",
         "libx264",
         "-preset",
@@ -222,13 +293,25 @@ def start_ffmpeg(width, height, fps):
         RTSP_OUT,
     ]
 
-    return subprocess.Popen(
+    proc = subprocess.Popen(
         cmd,
         stdin=subprocess.PIPE,
         stdout=subprocess.DEVNULL,
         stderr=subprocess.DEVNULL,
         bufsize=0,
     )
+    # Linux: grow the stdin pipe (default 64 KiB) so a whole I420 frame fits,
+    # up to the kernel's pipe-max-size; best effort elsewhere
+    if fcntl is None:
+        return proc
+    try:
+        with open("/proc/sys/fs/pipe-max-size") as f:
+            max_size = int(f.read())
+        frame_size = width * height * 3 // 2
+        fcntl.fcntl(proc.stdin, F_SETPIPE_SZ, min(max(frame_size, 1 << 20), max_size))
+    except (OSError, ValueError):
+        pass
+    return proc
 
 
 # ---- Threads ----
@@ -273,8 +356,9 @@ def reader():
 def processor():
     global running, ffmpeg_proc
     width = height = None
-    last_sent = 0.0
-    period = 1.0 / max(1, TARGET_FPS)
+    frame_idx = 0
+    motion, boxes = False, []
+    yuv = None  # I420 buffer, reused for every frame of the same size
 
     while running:
         try:
@@ -284,23 +368,27 @@ def processor():
 
         if width is None:
             height, width = frame.shape[:2]
+            # 4:2:0 chroma subsampling needs even dimensions
+            width, height = width & ~1, height & ~1
             ffmpeg_proc = start_ffmpeg(width, height, TARGET_FPS)
 
         # detect + draw overlay (IN-PLACE so overlay is saved & restreamed)
-        motion, boxes = detect_motion(frame)
+        if frame_idx % MOTION_STRIDE == 0:
+            motion, boxes = detect_motion(frame)
+        frame_idx += 1
         draw_overlay(frame, boxes, motion)
 
-        # pace to TARGET_FPS (best-effort)
-        now = time.time()
-        if last_sent:
-            sleep = period - (now - last_sent)
-            if sleep > 0:
-                time.sleep(sleep)
-        last_sent = time.time()
-
-        # send to ffmpeg (raw bgr)
+        # send to ffmpeg as raw I420, converted once here so FFmpeg skips
+        # its own swscale pass; stdin is unbuffered, so loop until the pipe
+        # has taken the whole frame. The write finishes before the next
+        # conversion, so the same buffer can be converted into every time.
         try:
-            ffmpeg_proc.stdin.write(frame.tobytes())  # type: ignore
+            yuv = cv2.cvtColor(
+                frame[:height, :width], cv2.COLOR_BGR2YUV_I420, dst=yuv
+            )
+            view = memoryview(yuv).cast("B")
+            while view:
+                view = view[ffmpeg_proc.stdin.write(view) :]  # type: ignore
         except (BrokenPipeError, IOError):
             # restart ffmpeg if it died
             try:
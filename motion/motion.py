@@ -2,7 +2,7 @@ from pathlib import Path
 import logging
 import requests
 from datetime import datetime, timedelta
-import pytz
+from zoneinfo import ZoneInfo
 import sys
 import os
 import json
@@ -32,7 +32,7 @@ logging.basicConfig(
     level=logging.INFO, format="%(asctime)s - %(levelname)s - %(message)s"
 )
 
-ist = pytz.timezone("Asia/Kolkata")
+ist = ZoneInfo("Asia/Kolkata")
 
 logging.info("=" * 50)
 logging.info("Motion Detection Video Processor Started")
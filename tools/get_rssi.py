@@ -4,7 +4,24 @@ Fetches WiFi signal strength from the camera's /rssi endpoint.
 Returns signal strength in dBm (-30 to -90, where higher values = better signal).
 """
 
+import threading
+
 import requests
+from requests.adapters import HTTPAdapter
+
+# One keep-alive session per polling thread (RSSI, memory, control), so each
+# reuses its connection without sharing a Session across threads.
+_local = threading.local()
+
+
+def get_esp_session() -> requests.Session:
+    """Return the calling thread's session for talking to the ESP32-CAM."""
+    session = getattr(_local, "session", None)
+    if session is None:
+        session = requests.Session()
+        session.mount("http://", HTTPAdapter(pool_connections=1, pool_maxsize=1))
+        _local.session = session
+    return session
 
 
 def get_rssi(timeout: float = 2.0) -> int | None:
@@ -17,7 +34,7 @@ def get_rssi(timeout: float = 2.0) -> int | None:
         RSSI value in dBm (e.g., -50) or None if request fails
     """
     try:
-        res = requests.get("http://192.168.0.13/rssi", timeout=timeout)
+        res = get_esp_session().get("http://192.168.0.13/rssi", timeout=timeout)
         data = res.json().get("rssi")
         return data if isinstance(data, int) else None
     except requests.exceptions.Timeout:
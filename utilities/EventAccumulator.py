@@ -16,8 +16,10 @@ class EventAccumulator:
         self.onSave: Callable[[Dict[str, float]], None] = onSave or self._default_save
         self._start_time: Optional[float] = None
         self._end_time: Optional[float] = None
-        self._timer: Optional[threading.Timer] = None
         self._lock = threading.Lock()
+        self._wakeup = threading.Condition(self._lock)
+        self._worker: Optional[threading.Thread] = None
+        self._saving = False  # worker is running onSave outside the lock
 
     def trigger(self):
         now = time.time()
@@ -27,26 +29,66 @@ class EventAccumulator:
                 self._start_time = now
             self._end_time = now + self.cooldown
 
-            if self._timer:
-                self._timer.cancel()
-            self._timer = threading.Timer(self.cooldown, self._save_event)
-            self._timer.start()
+            # One long-lived worker sleeps until the cooldown deadline instead
+            # of a new Timer thread per trigger; extending a running event
+            # only moves the deadline.
+            if self._worker is None or not self._worker.is_alive():
+                self._worker = threading.Thread(target=self._run, daemon=True)
+                self._worker.start()
+            elif is_new_event:
+                self._wakeup.notify()
         if is_new_event:
             self._logger.info("EventAccumulator started a new motion event.")
 
-    def _save_event(self):
+    def _run(self):
+        while True:
+            # Deadline check and snapshot/reset share one lock hold, so a
+            # trigger() can't extend the event after it was judged finished.
+            with self._lock:
+                while self._end_time is None or time.time() < self._end_time:
+                    timeout = None
+                    if self._end_time is not None:
+                        timeout = self._end_time - time.time()
+                    self._wakeup.wait(timeout)
+                event = self._pop_event()
+                self._saving = True
+            try:
+                self._save_event(event)
+            finally:
+                with self._lock:
+                    self._saving = False
+                    self._wakeup.notify_all()
+
+    def flush(self):
+        """Finalize the open event now rather than at its deadline.
+
+        The worker is a daemon thread, so call this on shutdown or the event
+        in progress is lost. Also waits for a save the worker has under way.
+        """
+        event = None
         with self._lock:
-            if self._start_time is None or self._end_time is None:
-                return
-            self._start_time -= 15.0
-            event = {
-                "start_time": self._start_time,
-                "end_time": self._end_time,
-                "duration": self._end_time - self._start_time,
-            }
-            self._start_time = None
-            self._end_time = None
-            self._timer = None
+            if self._start_time is not None:
+                self._end_time = min(self._end_time, time.time())
+                event = self._pop_event()
+            while self._saving:
+                self._wakeup.wait()
+        if event is not None:
+            self._save_event(event)
+
+    def _pop_event(self) -> Dict[str, float]:
+        """Snapshot the finished event and reset state; caller holds the lock."""
+        assert self._start_time is not None and self._end_time is not None
+        start_time = self._start_time - 15.0
+        event = {
+            "start_time": start_time,
+            "end_time": self._end_time,
+            "duration": self._end_time - start_time,
+        }
+        self._start_time = None
+        self._end_time = None
+        return event
+
+    def _save_event(self, event: Dict[str, float]):
         self._logger.info(
             "EventAccumulator finalized motion event: duration=%.2fs",
             event["duration"],